@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from datetime import date
@@ -9,7 +9,8 @@ import json
 from app.services.context_builder import build_context_for_date
 from app.services.action_engine import generate_actions_for_risks
 from app.services.groq_client import groq_client
-from app.db.session import SessionLocal
+from sqlalchemy.orm import Session
+from app.db.session import get_db
 from app.db.models import RecommendationFeedback
 
 router = APIRouter(prefix="/ai", tags=["AI Operations Copilot"])
@@ -192,33 +193,28 @@ async def ai_chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Error in chat response: {str(e)}")
 
 @router.post("/feedback")
-async def record_feedback(request: FeedbackRequest):
+async def record_feedback(request: FeedbackRequest, db: Session = Depends(get_db)):
     """Record user feedback on recommendations for learning"""
     try:
-        db = SessionLocal()
+        feedback = RecommendationFeedback(
+            recommendation_id=request.recommendation_id or "frontend_generated",
+            user_id="default",  # MVP: single user
+            action=request.feedback_type,  # Use feedback_type as action
+            context_hash=request.context_hash,
+            action_type=request.action_type,
+            action_parameters=request.action_parameters,
+            risk_score=request.risk_score
+        )
         
-        try:
-            feedback = RecommendationFeedback(
-                recommendation_id=request.recommendation_id or "frontend_generated",
-                user_id="default",  # MVP: single user
-                action=request.feedback_type,  # Use feedback_type as action
-                context_hash=request.context_hash,
-                action_type=request.action_type,
-                action_parameters=request.action_parameters,
-                risk_score=request.risk_score
-            )
-            
-            db.add(feedback)
-            db.commit()
-            db.refresh(feedback)
-            
-            return {
-                "status": "success",
-                "message": "Feedback recorded successfully",
-                "feedback_id": feedback.id
-            }
-        finally:
-            db.close()
+        db.add(feedback)
+        db.commit()
+        db.refresh(feedback)
+        
+        return {
+            "status": "success",
+            "message": "Feedback recorded successfully",
+            "feedback_id": feedback.id
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error recording feedback: {str(e)}")
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import date
-from app.db.session import SessionLocal
+from sqlalchemy.orm import Session
+from app.db.session import get_db
 from app.db.models import NewsEvents
 
 router = APIRouter(prefix="/news", tags=["News Events"])
@@ -29,11 +30,11 @@ class NewsEventResponse(BaseModel):
 async def get_news_events(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    event_type: Optional[str] = None
+    event_type: Optional[str] = None,
+    db: Session = Depends(get_db)
 ):
     """Get news events with optional filtering"""
     try:
-        db = SessionLocal()
         query = db.query(NewsEvents)
         
         if start_date:
@@ -44,7 +45,6 @@ async def get_news_events(
             query = query.filter(NewsEvents.event_type == event_type)
         
         events = query.order_by(NewsEvents.event_date.desc()).all()
-        db.close()
         
         return [
             NewsEventResponse(
@@ -64,7 +64,7 @@ async def get_news_events(
         raise HTTPException(status_code=500, detail=f"Error fetching news events: {str(e)}")
 
 @router.post("/", response_model=NewsEventResponse)
-async def create_news_event(request: NewsEventRequest):
+async def create_news_event(request: NewsEventRequest, db: Session = Depends(get_db)):
     """Create a new news event"""
     try:
         # Validate score modifier range
@@ -74,8 +74,6 @@ async def create_news_event(request: NewsEventRequest):
                 detail="score_modifier must be between -0.5 and 0.5"
             )
         
-        db = SessionLocal()
-        
         event = NewsEvents(
             event_date=request.event_date,
             event_type=request.event_type,
@@ -99,7 +97,6 @@ async def create_news_event(request: NewsEventRequest):
             created_at=event.created_at.isoformat()
         )
         
-        db.close()
         return response
         
     except HTTPException:
@@ -108,18 +105,16 @@ async def create_news_event(request: NewsEventRequest):
         raise HTTPException(status_code=500, detail=f"Error creating news event: {str(e)}")
 
 @router.delete("/{event_id}")
-async def delete_news_event(event_id: int):
+async def delete_news_event(event_id: int, db: Session = Depends(get_db)):
     """Delete a news event"""
     try:
-        db = SessionLocal()
-        event = db.query(NewsEvents).filter(NewsEvents.id == event_id).first()
+        event = db.get(NewsEvents, event_id)
         
         if not event:
             raise HTTPException(status_code=404, detail="News event not found")
         
         db.delete(event)
         db.commit()
-        db.close()
         
         return {"status": "success", "message": "News event deleted"}
         
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
-from app.db.session import SessionLocal
+from sqlalchemy.orm import Session
+from app.db.session import get_db
 from app.db.models import UserPreferences
 
 router = APIRouter(prefix="/preferences", tags=["User Preferences"])
@@ -19,12 +20,10 @@ class PreferencesResponse(BaseModel):
     updated_at: Optional[str] = None
 
 @router.get("/", response_model=PreferencesResponse)
-async def get_user_preferences():
+async def get_user_preferences(db: Session = Depends(get_db)):
     """Get current user preferences"""
     try:
-        db = SessionLocal()
         prefs = db.query(UserPreferences).filter(UserPreferences.user_id == "default").first()
-        db.close()
         
         if not prefs:
             # Return defaults if no preferences set
@@ -46,7 +45,7 @@ async def get_user_preferences():
         raise HTTPException(status_code=500, detail=f"Error fetching preferences: {str(e)}")
 
 @router.post("/", response_model=PreferencesResponse)
-async def update_user_preferences(request: PreferencesRequest):
+async def update_user_preferences(request: PreferencesRequest, db: Session = Depends(get_db)):
     """Update user preferences"""
     try:
         # Validate input values
@@ -62,8 +61,6 @@ async def update_user_preferences(request: PreferencesRequest):
         if request.multi_location_aggressiveness not in valid_priority:
             raise HTTPException(status_code=400, detail=f"multi_location_aggressiveness must be one of: {valid_priority}")
         
-        db = SessionLocal()
-        
         # Check if preferences exist
         prefs = db.query(UserPreferences).filter(UserPreferences.user_id == "default").first()
         
@@ -92,7 +89,6 @@ async def update_user_preferences(request: PreferencesRequest):
             updated_at=prefs.updated_at.isoformat() if prefs.updated_at else None
         )
         
-        db.close()
         return response
         
     except HTTPException:
@@ -1,14 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from datetime import date
-from app.db.session import SessionLocal
+from sqlalchemy.orm import Session
+from app.db.session import get_db
 from app.db.models import BatchRisk
 
 router = APIRouter()
 
 
 @router.get("/risk")
-def get_risk(snapshot_date: date):
-    db = SessionLocal()
+def get_risk(snapshot_date: date, db: Session = Depends(get_db)):
     rows = (
         db.query(BatchRisk)
         .filter(BatchRisk.snapshot_date == snapshot_date)
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, Date, Numeric,
-    TIMESTAMP, JSON, PrimaryKeyConstraint
+    TIMESTAMP, JSON, PrimaryKeyConstraint, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
@@ -77,6 +77,8 @@ class BatchRisk(Base):
     risk_score = Column(Numeric)
     __table_args__ = (
         PrimaryKeyConstraint("snapshot_date", "store_id", "sku_id", "batch_id"),
+        # Serves the per-snapshot "top N by risk_score" reads without a sort
+        Index("ix_batch_risk_snapshot_score", "snapshot_date", "risk_score"),
     )
 
 
@@ -96,7 +98,7 @@ class RecommendationFeedback(Base):
     id = Column(Integer, primary_key=True)
     recommendation_id = Column(String)
     user_id = Column(String, default="default")
-    timestamp = Column(TIMESTAMP, server_default=func.now())
+    timestamp = Column(TIMESTAMP, server_default=func.now(), index=True)
     action = Column(String)  # accepted, rejected, dismissed
     context_hash = Column(String)  # store_id:sku_id:batch_id
     action_type = Column(String)  # markdown, transfer, reorder_pause, etc.
@@ -107,7 +109,7 @@ class RecommendationFeedback(Base):
 class NewsEvents(Base):
     __tablename__ = "news_events"
     id = Column(Integer, primary_key=True)
-    event_date = Column(Date)
+    event_date = Column(Date, index=True)
     event_type = Column(String)  # demand_spike, supplier_delay, seasonal, etc.
     description = Column(String)
     impact_stores = Column(JSON)  # List of affected store_ids
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 import os
 
@@ -7,8 +7,29 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///../theperfectshop.db")
 
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets API reads proceed while a pipeline run is writing, and
+        # synchronous=NORMAL is durable enough under WAL without an fsync per commit
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
 else:
     engine = create_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 SessionLocal = sessionmaker(bind=engine)
+
+
+def get_db():
+    """Yield a session for one request and close it once the response is sent"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,8 +1,13 @@
 from typing import List, Dict, Any, Optional
 from datetime import date
+from sqlalchemy import func
 from app.db.models import BatchRisk, UserPreferences, RecommendationFeedback
 from app.db.session import SessionLocal
 
+PRIORITY_SCORES = {"high": 10, "medium": 5, "low": 2}
+WASTE_MIN_ACTIONS = frozenset({"markdown", "fefo_attention"})
+PROFIT_ACTIONS = frozenset({"transfer", "bundle"})
+
 class ActionEngine:
     def __init__(self):
         self.db = SessionLocal()
@@ -170,10 +175,9 @@ class ActionEngine:
     
     def _calculate_base_score(self, action: Dict) -> float:
         """Calculate base ranking score for action"""
-        priority_scores = {"high": 10, "medium": 5, "low": 2}
         confidence_weight = action["confidence"] * 5
         
-        return priority_scores.get(action["priority"], 0) + confidence_weight
+        return PRIORITY_SCORES.get(action["priority"], 0) + confidence_weight
     
     def _apply_preference_modifier(self, action: Dict, preferences: Dict) -> float:
         """Apply user preference modifiers to action ranking"""
@@ -181,10 +185,10 @@ class ActionEngine:
         optimize_for = preferences.get("optimize_for", "balanced")
         
         if optimize_for == "waste_min":
-            if action["action_type"] in ["markdown", "fefo_attention"]:
+            if action["action_type"] in WASTE_MIN_ACTIONS:
                 modifier += 2.0
         elif optimize_for == "profit":
-            if action["action_type"] in ["transfer", "bundle"]:
+            if action["action_type"] in PROFIT_ACTIONS:
                 modifier += 2.0
             elif action["action_type"] == "markdown":
                 modifier -= 1.0
@@ -215,14 +219,23 @@ class ActionEngine:
     
     def _get_feedback_patterns(self) -> Dict[str, Dict[str, int]]:
         """Get feedback patterns for learning"""
-        feedback = self.db.query(RecommendationFeedback).all()
+        # Let the database count per (action_type, action) instead of loading every row
+        counts = (
+            self.db.query(
+                RecommendationFeedback.action_type,
+                RecommendationFeedback.action,
+                func.count(),
+            )
+            .group_by(RecommendationFeedback.action_type, RecommendationFeedback.action)
+            .order_by(func.min(RecommendationFeedback.id))
+            .all()
+        )
         
         patterns = {}
-        for f in feedback:
-            action_type = f.action_type
+        for action_type, action, count in counts:
             if action_type not in patterns:
                 patterns[action_type] = {"accepted": 0, "rejected": 0, "dismissed": 0}
-            patterns[action_type][f.action] += 1
+            patterns[action_type][action] += count
         
         return patterns
     
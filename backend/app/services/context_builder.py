@@ -1,6 +1,6 @@
 from datetime import date, timedelta
 from typing import Dict, Any, Optional, List
-from sqlalchemy import text, desc
+from sqlalchemy import text, desc, func
 from app.db.session import SessionLocal, engine
 from app.db.models import BatchRisk, FeatureStoreSKU, InventoryBatch, SalesDaily, UserPreferences, RecommendationFeedback, NewsEvents
 import pandas as pd
@@ -95,11 +95,22 @@ class ContextBuilder:
                 "total_batches": 0
             }
         
-        total_value = sum(float(r.at_risk_value) for r in risks)
-        total_units = sum(r.at_risk_units for r in risks)
-        high_risk = sum(1 for r in risks if r.risk_score >= 70)
-        medium_risk = sum(1 for r in risks if 40 <= r.risk_score < 70)
-        avg_days = sum(r.days_to_expiry for r in risks) / len(risks)
+        total_value = 0
+        total_units = 0
+        total_days = 0
+        high_risk = medium_risk = 0
+        
+        for r in risks:
+            total_value += float(r.at_risk_value)
+            total_units += r.at_risk_units
+            total_days += r.days_to_expiry
+            
+            if r.risk_score >= 70:
+                high_risk += 1
+            elif r.risk_score >= 40:
+                medium_risk += 1
+        
+        avg_days = total_days / len(risks)
         
         return {
             "total_at_risk_value": round(total_value, 2),
@@ -155,22 +166,31 @@ class ContextBuilder:
         # Get feedback from last 30 days
         cutoff_date = date.today() - timedelta(days=30)
         
-        feedback = self.db.query(RecommendationFeedback).filter(
-            RecommendationFeedback.timestamp >= cutoff_date
-        ).all()
-        
-        if not feedback:
+        counts = (
+            self.db.query(
+                RecommendationFeedback.action_type,
+                RecommendationFeedback.action,
+                func.count(),
+            )
+            .filter(RecommendationFeedback.timestamp >= cutoff_date)
+            .group_by(RecommendationFeedback.action_type, RecommendationFeedback.action)
+            .order_by(func.min(RecommendationFeedback.id))
+            .all()
+        )
+        
+        if not counts:
             return {"total_feedback": 0, "patterns": {}}
         
         patterns = {}
-        for f in feedback:
-            action_type = f.action_type
+        total_feedback = 0
+        for action_type, action, count in counts:
             if action_type not in patterns:
                 patterns[action_type] = {"accepted": 0, "rejected": 0, "dismissed": 0}
-            patterns[action_type][f.action] += 1
+            patterns[action_type][action] += count
+            total_feedback += count
         
         return {
-            "total_feedback": len(feedback),
+            "total_feedback": total_feedback,
             "patterns": patterns
         }
     
@@ -215,48 +235,70 @@ class ContextBuilder:
         if sku_id:
             df = df[df.get('sku_id') == sku_id]
         
-        # Calculate basic risk metrics from the data
+        # Calculate basic risk metrics from the data, one column at a time
         risk_items = []
         total_value = 0
         total_units = 0
         
-        for _, row in df.iterrows():
-            # Calculate days to expiry
-            try:
-                expiry_date = pd.to_datetime(row.get('expiry_date', '2024-12-31')).date()
-                days_to_expiry = (expiry_date - snapshot_date).days
-            except:
-                days_to_expiry = 30  # Default if parsing fails
+        if not df.empty:
+            def column(name, default):
+                return df[name] if name in df.columns else pd.Series(default, index=df.index)
+            
+            # Calculate days to expiry, defaulting when parsing fails
+            expiry_raw = column('expiry_date', '2024-12-31')
+            days_to_expiry = self._days_to_expiry(expiry_raw, snapshot_date)
             
             # Calculate risk score (simple heuristic)
-            qty = float(row.get('on_hand_qty', 0))
-            cost = float(row.get('cost_per_unit', 0))
+            qty = column('on_hand_qty', 0).astype(float)
+            cost = column('cost_per_unit', 0).astype(float)
             value = qty * cost
+            selling_price = (
+                df['selling_price'].astype(float) if 'selling_price' in df.columns else cost * 1.5
+            )
             
             # Risk factors
-            expiry_risk = max(0, (30 - days_to_expiry) / 30)  # Higher risk as expiry approaches
-            quantity_risk = min(qty / 100, 1.0)  # Higher risk for larger quantities
+            expiry_risk = ((30 - days_to_expiry) / 30).clip(lower=0)  # Higher risk as expiry approaches
+            quantity_risk = (qty / 100).clip(upper=1.0)  # Higher risk for larger quantities
             risk_score = (expiry_risk * 0.7 + quantity_risk * 0.3) * 100
             
-            total_value += value
-            total_units += qty
+            total_value = sum(value.tolist())
+            total_units = sum(qty.tolist())
+            
+            significant = risk_score > 20  # Only include items with significant risk
             
-            if risk_score > 20:  # Only include items with significant risk
+            def picked(series):
+                return series[significant].astype(object).tolist()
+            
+            for (store, sku, batch, product, category, q, v, expiry_value,
+                 c, price, days, score) in zip(
+                picked(column('store_id', 'UNKNOWN')),
+                picked(column('sku_id', 'UNKNOWN')),
+                picked(column('batch_id', 'UNKNOWN')),
+                picked(column('product_name', 'Unknown Product')),
+                picked(column('category', 'Unknown')),
+                picked(qty),
+                picked(value),
+                picked(expiry_raw),
+                picked(cost),
+                picked(selling_price),
+                picked(days_to_expiry),
+                picked(risk_score),
+            ):
                 risk_items.append({
-                    "store_id": row.get('store_id', 'UNKNOWN'),
-                    "sku_id": row.get('sku_id', 'UNKNOWN'),
-                    "batch_id": row.get('batch_id', 'UNKNOWN'),
-                    "product_name": row.get('product_name', 'Unknown Product'),
-                    "category": row.get('category', 'Unknown'),
-                    "on_hand_qty": qty,
-                    "at_risk_units": qty,  # Add expected field name
-                    "at_risk_value": value,  # Add expected field name
-                    "expiry_date": row.get('expiry_date', '2024-12-31'),
-                    "cost_per_unit": cost,
-                    "selling_price": float(row.get('selling_price', cost * 1.5)),
-                    "days_to_expiry": days_to_expiry,
-                    "risk_score": risk_score,
-                    "total_value": value
+                    "store_id": store,
+                    "sku_id": sku,
+                    "batch_id": batch,
+                    "product_name": product,
+                    "category": category,
+                    "on_hand_qty": q,
+                    "at_risk_units": q,  # Add expected field name
+                    "at_risk_value": v,  # Add expected field name
+                    "expiry_date": expiry_value,
+                    "cost_per_unit": c,
+                    "selling_price": price,
+                    "days_to_expiry": days,
+                    "risk_score": score,
+                    "total_value": v
                 })
         
         # Sort by risk score and limit
@@ -271,12 +313,7 @@ class ContextBuilder:
             },
             "risk_items": risk_items,
             "key_metrics": {
-                "total_at_risk_value": sum(item['total_value'] for item in risk_items),
-                "total_at_risk_units": sum(item['on_hand_qty'] for item in risk_items),
-                "high_risk_batches": len([item for item in risk_items if item['risk_score'] > 70]),
-                "medium_risk_batches": len([item for item in risk_items if 30 < item['risk_score'] <= 70]),
-                "low_risk_batches": len([item for item in risk_items if item['risk_score'] <= 30]),
-                "avg_days_to_expiry": sum(item['days_to_expiry'] for item in risk_items) / len(risk_items) if risk_items else 0,
+                **self._summarize_risk_items(risk_items),
                 "total_inventory_value": total_value,
                 "total_inventory_units": total_units
             },
@@ -287,6 +324,50 @@ class ContextBuilder:
         
         return context
     
+    def _days_to_expiry(self, expiry_raw: pd.Series, snapshot_date: date) -> pd.Series:
+        """Days from snapshot_date to each expiry date, 30 where a date cannot be parsed"""
+        try:
+            expiry = pd.to_datetime(expiry_raw, errors='coerce', format='mixed')
+            if expiry.dt.tz is not None:
+                expiry = expiry.dt.tz_localize(None)
+            return (expiry.dt.normalize() - pd.Timestamp(snapshot_date)).dt.days.fillna(30).astype(int)
+        except (TypeError, ValueError, AttributeError):
+            # Mixed timezones and similar inputs fall back to parsing each value
+            def days(value):
+                try:
+                    return (pd.to_datetime(value).date() - snapshot_date).days
+                except Exception:
+                    return 30
+            return expiry_raw.map(days)
+    
+    def _summarize_risk_items(self, risk_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate totals and risk bands for data-only mode in a single pass"""
+        total_value = 0
+        total_units = 0
+        total_days = 0
+        high_risk = medium_risk = low_risk = 0
+        
+        for item in risk_items:
+            total_value += item['total_value']
+            total_units += item['on_hand_qty']
+            total_days += item['days_to_expiry']
+            
+            if item['risk_score'] > 70:
+                high_risk += 1
+            elif item['risk_score'] > 30:
+                medium_risk += 1
+            else:
+                low_risk += 1
+        
+        return {
+            "total_at_risk_value": total_value,
+            "total_at_risk_units": total_units,
+            "high_risk_batches": high_risk,
+            "medium_risk_batches": medium_risk,
+            "low_risk_batches": low_risk,
+            "avg_days_to_expiry": total_days / len(risk_items) if risk_items else 0
+        }
+    
     def _get_default_preferences(self) -> Dict[str, Any]:
         """Get default user preferences when no database is available"""
         return {
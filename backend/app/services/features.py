@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 from datetime import timedelta
@@ -21,25 +22,33 @@ def build_features(snapshot_date):
         },
     )
 
+    # SQLite hands dates back as strings; parse them once for the whole frame
+    df["date"] = pd.to_datetime(df["date"])
+
     rows = []
 
     for (store, sku), g in df.groupby(["store_id", "sku_id"]):
-        g = g.sort_values("date")
-        g = g.set_index("date").asfreq("D", fill_value=0)
+        # Zero-filled daily sales from the group's first to last sale day
+        offsets = (g["date"] - g["date"].min()).dt.days.to_numpy()
+        daily = np.zeros(offsets.max() + 1)
+        daily[offsets] = g["units_sold"].to_numpy()
 
         rows.append(
-            FeatureStoreSKU(
-                date=snapshot_date,
-                store_id=store,
-                sku_id=sku,
-                v7=g.tail(7)["units_sold"].mean(),
-                v14=g.tail(14)["units_sold"].mean(),
-                v30=g["units_sold"].mean(),
-                volatility=g["units_sold"].std(),
-            )
+            {
+                "date": snapshot_date,
+                "store_id": store,
+                "sku_id": sku,
+                "v7": float(daily[-7:].mean()),
+                "v14": float(daily[-14:].mean()),
+                "v30": float(daily.mean()),
+                "volatility": float(daily.std(ddof=1)) if daily.size > 1 else float("nan"),
+            }
         )
 
+    # Features are rebuilt wholesale per snapshot, so replace them in one pass
     db = SessionLocal()
-    for r in rows:
-        db.merge(r)
+    db.query(FeatureStoreSKU).filter(FeatureStoreSKU.date == snapshot_date).delete(
+        synchronize_session=False
+    )
+    db.bulk_insert_mappings(FeatureStoreSKU, rows)
     db.commit()
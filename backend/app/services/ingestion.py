@@ -1,4 +1,7 @@
+from functools import lru_cache
+
 import pandas as pd
+from sqlalchemy.dialects import postgresql, sqlite
 from app.db.session import SessionLocal
 from app.db.models import SalesDaily, InventoryBatch, Purchase
 
@@ -11,59 +14,101 @@ COLUMN_ALIASES = {
     "on_hand_qty": ["qty", "on hand", "stock"],
 }
 
+ALIAS_TO_CANONICAL = {
+    alias: canonical
+    for canonical, aliases in COLUMN_ALIASES.items()
+    for alias in aliases
+}
+
+
+@lru_cache(maxsize=128)
+def _column_mapping(columns: tuple):
+    # Uploads from the same source repeat the same header, so resolve it once
+    cleaned = [c.lower().strip() for c in columns]
+    rename_map = {
+        col: ALIAS_TO_CANONICAL[col]
+        for col in cleaned
+        if col in ALIAS_TO_CANONICAL
+    }
+    return cleaned, rename_map
+
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df.columns = [c.lower().strip() for c in df.columns]
-    rename_map = {}
-    for canonical, aliases in COLUMN_ALIASES.items():
-        for col in df.columns:
-            if col in aliases:
-                rename_map[col] = canonical
+    cleaned, rename_map = _column_mapping(tuple(df.columns))
+    df.columns = cleaned
     return df.rename(columns=rename_map)
 
 
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _upsert(db, model, rows, key_columns):
+    """Insert rows, overwriting any existing row with the same key like db.merge"""
+    insert = UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        for row in rows:
+            db.merge(model(**row))
+        return
+
+    # Keep the last row per key, as successive merges would
+    rows = list({tuple(row[k] for k in key_columns): row for row in rows}.values())
+    if not rows:
+        return
+
+    stmt = insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={col: stmt.excluded[col] for col in rows[0] if col not in key_columns},
+    )
+    db.execute(stmt, rows)
+
+
 def load_sales(df: pd.DataFrame):
     db = SessionLocal()
-    for _, r in df.iterrows():
-        db.merge(
-            SalesDaily(
-                date=r["date"],
-                store_id=r["store_id"],
-                sku_id=r["sku_id"],
-                units_sold=int(r["units_sold"]),
-                selling_price=r.get("selling_price"),
-            )
-        )
+    rows = [
+        {
+            "date": r["date"],
+            "store_id": r["store_id"],
+            "sku_id": r["sku_id"],
+            "units_sold": int(r["units_sold"]),
+            "selling_price": r.get("selling_price"),
+        }
+        for r in df.to_dict("records")
+    ]
+    _upsert(db, SalesDaily, rows, ["date", "store_id", "sku_id"])
     db.commit()
 
 
 def load_inventory(df: pd.DataFrame):
     db = SessionLocal()
-    for _, r in df.iterrows():
-        db.merge(
-            InventoryBatch(
-                snapshot_date=r["snapshot_date"],
-                store_id=r["store_id"],
-                sku_id=r["sku_id"],
-                batch_id=r["batch_id"],
-                expiry_date=r["expiry_date"],
-                on_hand_qty=int(r["on_hand_qty"]),
-            )
-        )
+    rows = [
+        {
+            "snapshot_date": r["snapshot_date"],
+            "store_id": r["store_id"],
+            "sku_id": r["sku_id"],
+            "batch_id": r["batch_id"],
+            "expiry_date": r["expiry_date"],
+            "on_hand_qty": int(r["on_hand_qty"]),
+        }
+        for r in df.to_dict("records")
+    ]
+    _upsert(db, InventoryBatch, rows, ["snapshot_date", "store_id", "sku_id", "batch_id"])
     db.commit()
 
 
 def load_purchases(df: pd.DataFrame):
     db = SessionLocal()
-    for _, r in df.iterrows():
-        db.add(
-            Purchase(
-                received_date=r["received_date"],
-                store_id=r["store_id"],
-                sku_id=r["sku_id"],
-                batch_id=r["batch_id"],
-                received_qty=int(r["received_qty"]),
-                unit_cost=float(r["unit_cost"]),
-            )
-        )
+    rows = [
+        {
+            "received_date": r["received_date"],
+            "store_id": r["store_id"],
+            "sku_id": r["sku_id"],
+            "batch_id": r["batch_id"],
+            "received_qty": int(r["received_qty"]),
+            "unit_cost": float(r["unit_cost"]),
+        }
+        for r in df.to_dict("records")
+    ]
+    # Purchases are append-only, so skip per-object unit-of-work bookkeeping
+    db.bulk_insert_mappings(Purchase, rows)
     db.commit()
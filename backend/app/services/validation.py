@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+
+
 def validate_dataframe(df, required_columns):
     errors = {}
 
@@ -6,12 +10,12 @@ def validate_dataframe(df, required_columns):
             errors[col] = "missing"
 
     if "on_hand_qty" in df.columns:
-        neg = (df["on_hand_qty"] < 0).sum()
+        neg = np.count_nonzero(df["on_hand_qty"].to_numpy() < 0)
         if neg > 0:
             errors["on_hand_qty"] = f"{neg} negative values"
 
     if "expiry_date" in df.columns:
-        missing = df["expiry_date"].isna().sum()
+        missing = np.count_nonzero(pd.isna(df["expiry_date"].to_numpy()))
         if missing > 0:
             errors["expiry_date"] = f"{missing} missing expiry dates"
 
@@ -8,7 +8,7 @@ import os
 import sys
 import pandas as pd
 from datetime import date, datetime, timedelta
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, func, select, text
 from sqlalchemy.orm import sessionmaker
 
 # Add the app directory to Python path
@@ -94,6 +94,7 @@ def load_sample_inventory_data():
     try:
         # Convert to inventory batches
         snapshot_date = date.today()
+        purchases = []
         
         for _, row in df.iterrows():
             # Create inventory batch
@@ -108,16 +109,17 @@ def load_sample_inventory_data():
             db.merge(inventory)
             
             # Create purchase record
-            purchase = Purchase(
-                received_date=snapshot_date - timedelta(days=30),  # 30 days ago
-                store_id=row['store_id'],
-                sku_id=row['sku_id'],
-                batch_id=row['batch_id'],
-                received_qty=int(row['on_hand_qty']) + 50,  # Assume some was sold
-                unit_cost=float(row['unit_cost'])
-            )
-            db.add(purchase)
+            purchases.append({
+                "received_date": snapshot_date - timedelta(days=30),  # 30 days ago
+                "store_id": row['store_id'],
+                "sku_id": row['sku_id'],
+                "batch_id": row['batch_id'],
+                "received_qty": int(row['on_hand_qty']) + 50,  # Assume some was sold
+                "unit_cost": float(row['unit_cost'])
+            })
         
+        # Purchases are append-only, so insert them in one batch
+        db.bulk_insert_mappings(Purchase, purchases)
         db.commit()
         print(f"✅ Loaded {len(df)} inventory batches")
         
@@ -260,11 +262,13 @@ def verify_setup():
     db = SessionLocal()
     
     try:
-        # Check data counts
-        inventory_count = db.query(InventoryBatch).count()
-        sales_count = db.query(SalesDaily).count()
-        features_count = db.query(FeatureStoreSKU).count()
-        risk_count = db.query(BatchRisk).count()
+        # Check data counts in a single round trip
+        inventory_count, sales_count, features_count, risk_count = db.execute(
+            select(*(
+                select(func.count()).select_from(model).scalar_subquery()
+                for model in (InventoryBatch, SalesDaily, FeatureStoreSKU, BatchRisk)
+            ))
+        ).one()
         
         print(f"  📦 Inventory batches: {inventory_count}")
         print(f"  📊 Sales records: {sales_count}")
@@ -8,7 +8,7 @@ import os
 import sys
 import pandas as pd
 from datetime import date, datetime, timedelta
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, func, select, text
 from sqlalchemy.orm import sessionmaker
 
 # Add the app directory to Python path
@@ -86,6 +86,7 @@ def load_sample_inventory_data():
     try:
         # Convert to inventory batches
         snapshot_date = date.today()
+        purchases = []
         
         for _, row in df.iterrows():
             # Create inventory batch
@@ -100,16 +101,17 @@ def load_sample_inventory_data():
             db.merge(inventory)
             
             # Create purchase record
-            purchase = Purchase(
-                received_date=snapshot_date - timedelta(days=30),  # 30 days ago
-                store_id=row['store_id'],
-                sku_id=row['sku_id'],
-                batch_id=row['batch_id'],
-                received_qty=int(row['on_hand_qty']) + 50,  # Assume some was sold
-                unit_cost=float(row['unit_cost'])
-            )
-            db.add(purchase)
+            purchases.append({
+                "received_date": snapshot_date - timedelta(days=30),  # 30 days ago
+                "store_id": row['store_id'],
+                "sku_id": row['sku_id'],
+                "batch_id": row['batch_id'],
+                "received_qty": int(row['on_hand_qty']) + 50,  # Assume some was sold
+                "unit_cost": float(row['unit_cost'])
+            })
         
+        # Purchases are append-only, so insert them in one batch
+        db.bulk_insert_mappings(Purchase, purchases)
         db.commit()
         print(f"✅ Loaded {len(df)} inventory batches")
         
@@ -168,24 +170,33 @@ def build_features_and_risk():
         print("  - Building sales velocity features...")
         
         # Get sales data for last 30 days
-        sales_data = db.query(SalesDaily).filter(
+        sales_query = db.query(
+            SalesDaily.store_id, SalesDaily.sku_id, SalesDaily.units_sold
+        ).filter(
             SalesDaily.date >= snapshot_date - timedelta(days=30)
-        ).all()
+        )
+        sales_df = pd.read_sql(sales_query.statement, db.bind)
         
-        # Group by store and SKU
-        sales_by_store_sku = {}
-        for sale in sales_data:
-            key = (sale.store_id, sale.sku_id)
-            if key not in sales_by_store_sku:
-                sales_by_store_sku[key] = []
-            sales_by_store_sku[key].append(sale.units_sold)
+        # Group by store and SKU, keeping each group's rows in query order
+        keys = ["store_id", "sku_id"]
+        grouped = sales_df.groupby(keys, sort=False)["units_sold"]
+        from_end = grouped.cumcount(ascending=False)
+        stats = pd.DataFrame({
+            "count": grouped.size(),
+            "v30": grouped.mean(),
+            "last7": sales_df[from_end < 7].groupby(keys, sort=False)["units_sold"].sum(),
+            "last14": sales_df[from_end < 14].groupby(keys, sort=False)["units_sold"].sum(),
+            "volatility": grouped.std().fillna(0),
+        })
+        stats["v7"] = (stats["last7"] / 7).where(stats["count"] >= 7, stats["v30"])
+        stats["v14"] = (stats["last14"] / 14).where(stats["count"] >= 14, stats["v30"])
         
         # Calculate features
-        for (store_id, sku_id), sales_list in sales_by_store_sku.items():
-            v7 = sum(sales_list[-7:]) / 7 if len(sales_list) >= 7 else sum(sales_list) / len(sales_list)
-            v14 = sum(sales_list[-14:]) / 14 if len(sales_list) >= 14 else sum(sales_list) / len(sales_list)
-            v30 = sum(sales_list) / len(sales_list)
-            volatility = pd.Series(sales_list).std() if len(sales_list) > 1 else 0
+        for (store_id, sku_id), row in stats.iterrows():
+            v7 = float(row["v7"])
+            v14 = float(row["v14"])
+            v30 = float(row["v30"])
+            volatility = float(row["volatility"])
             
             feature = FeatureStoreSKU(
                 date=snapshot_date,
@@ -328,11 +339,13 @@ def verify_setup():
     db = SessionLocal()
     
     try:
-        # Check data counts
-        inventory_count = db.query(InventoryBatch).count()
-        sales_count = db.query(SalesDaily).count()
-        features_count = db.query(FeatureStoreSKU).count()
-        risk_count = db.query(BatchRisk).count()
+        # Check data counts in a single round trip
+        inventory_count, sales_count, features_count, risk_count = db.execute(
+            select(*(
+                select(func.count()).select_from(model).scalar_subquery()
+                for model in (InventoryBatch, SalesDaily, FeatureStoreSKU, BatchRisk)
+            ))
+        ).one()
         
         print(f"  📦 Inventory batches: {inventory_count}")
         print(f"  📊 Sales records: {sales_count}")
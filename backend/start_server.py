@@ -54,7 +54,8 @@ def start_server():
             host="0.0.0.0",
             port=8000,
             reload=True,
-            log_level="info"
+            log_level="info",
+            access_log=False
         )
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
@@ -4,17 +4,80 @@ Basic test script for core endpoints without requiring Groq API.
 Tests the database functionality and basic API responses.
 """
 
+import contextlib
+import functools
+import io
+import sys
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 import json
+import orjson
 from datetime import date
 
 API_BASE = "http://localhost:8000"
 
+# One keep-alive connection pool shared by every request in this script
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+# These scripts are short-lived, so the date is resolved once per run
+_TODAY_ISO = date.today().isoformat()
+
+# Request bodies are serialized once at import rather than on every call
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_PREFERENCES_BODY = orjson.dumps({
+    "optimize_for": "waste_min",
+    "service_level_priority": "high",
+    "multi_location_aggressiveness": "low"
+})
+
+_FEEDBACK_BODY = orjson.dumps({
+    "recommendation_id": "test_rec_123",
+    "action": "accepted",
+    "context_hash": "store1:sku1:batch1",
+    "action_type": "markdown",
+    "action_parameters": {"discount": 0.2},
+    "risk_score": 85.5
+})
+
+@functools.lru_cache(maxsize=1)
+def _news_event_body(event_date):
+    """Serialize the news event payload once per event date"""
+    return orjson.dumps({
+        "event_date": event_date,
+        "event_type": "test_event",
+        "description": "Test event for API validation",
+        "impact_stores": ["S001"],
+        "impact_skus": ["SKU101"],
+        "score_modifier": 0.1
+    })
+
+class _ThreadOutput(io.TextIOBase):
+    """stdout proxy that keeps each worker thread's prints in its own buffer"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, "buffer", self._stream).write(text)
+    
+    def capture(self, test_func):
+        """Run test_func and return (result, everything it printed)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return test_func(), self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
 def test_risk_endpoint():
     """Test the basic risk endpoint"""
     print("⚠️ Testing risk endpoint...")
     try:
-        response = requests.get(f"{API_BASE}/risk", params={"snapshot_date": date.today().isoformat()}, timeout=10)
+        response = SESSION.get(f"{API_BASE}/risk", params={"snapshot_date": _TODAY_ISO}, timeout=10)
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -35,19 +98,14 @@ def test_preferences():
     print("\n⚙️ Testing preferences...")
     try:
         # Get preferences
-        response = requests.get(f"{API_BASE}/preferences/", timeout=10)
+        response = SESSION.get(f"{API_BASE}/preferences/", timeout=10)
         print(f"Get Status: {response.status_code}")
         
         if response.status_code == 200:
             print(f"Current Preferences: {response.json()}")
         
         # Update preferences
-        payload = {
-            "optimize_for": "waste_min",
-            "service_level_priority": "high",
-            "multi_location_aggressiveness": "low"
-        }
-        response = requests.post(f"{API_BASE}/preferences/", json=payload, timeout=10)
+        response = SESSION.post(f"{API_BASE}/preferences/", data=_PREFERENCES_BODY, headers=_JSON_HEADERS, timeout=10)
         print(f"Update Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -64,15 +122,7 @@ def test_feedback():
     """Test feedback endpoint"""
     print("\n📝 Testing feedback...")
     try:
-        payload = {
-            "recommendation_id": "test_rec_123",
-            "action": "accepted",
-            "context_hash": "store1:sku1:batch1",
-            "action_type": "markdown",
-            "action_parameters": {"discount": 0.2},
-            "risk_score": 85.5
-        }
-        response = requests.post(f"{API_BASE}/ai/feedback", json=payload, timeout=10)
+        response = SESSION.post(f"{API_BASE}/ai/feedback", data=_FEEDBACK_BODY, headers=_JSON_HEADERS, timeout=10)
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -90,7 +140,7 @@ def test_news_events():
     print("\n📰 Testing news events...")
     try:
         # Get news events
-        response = requests.get(f"{API_BASE}/news/", timeout=10)
+        response = SESSION.get(f"{API_BASE}/news/", timeout=10)
         print(f"Get Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -100,15 +150,12 @@ def test_news_events():
                 print(f"Sample event: {events[0]}")
         
         # Create a news event
-        payload = {
-            "event_date": date.today().isoformat(),
-            "event_type": "test_event",
-            "description": "Test event for API validation",
-            "impact_stores": ["S001"],
-            "impact_skus": ["SKU101"],
-            "score_modifier": 0.1
-        }
-        response = requests.post(f"{API_BASE}/news/", json=payload, timeout=10)
+        response = SESSION.post(
+            f"{API_BASE}/news/",
+            data=_news_event_body(_TODAY_ISO),
+            headers=_JSON_HEADERS,
+            timeout=10
+        )
         print(f"Create Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -133,9 +180,16 @@ def main():
         ("News Events", test_news_events)
     ]
     
+    # The checks hit disjoint endpoints, so run them concurrently and
+    # replay each one's output in order once it finishes
+    output = _ThreadOutput(sys.stdout)
+    with contextlib.redirect_stdout(output), ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [(test_name, executor.submit(output.capture, test_func)) for test_name, test_func in tests]
+    
     results = []
-    for test_name, test_func in tests:
-        success = test_func()
+    for test_name, future in futures:
+        success, log = future.result()
+        print(log, end="")
         results.append((test_name, success))
     
     print("\n" + "=" * 50)
@@ -3,6 +3,7 @@
 Test available Groq models
 """
 
+import asyncio
 import httpx
 import json
 import os
@@ -14,59 +15,69 @@ load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_BASE_URL = "https://api.groq.com/openai/v1"
 
-def test_models():
-    """Test different Groq models"""
-    print("🔍 Testing available Groq models...")
-    
-    # Common Groq models to try
-    models_to_test = [
-        "llama-3.1-8b-instant",
-        "llama-3.2-1b-preview",
-        "llama-3.2-3b-preview", 
-        "llama3-8b-8192",
-        "llama3-70b-8192",
-        "mixtral-8x7b-32768",
-        "gemma-7b-it"
-    ]
+# Common Groq models to try
+MODELS_TO_TEST = [
+    "llama-3.1-8b-instant",
+    "llama-3.2-1b-preview",
+    "llama-3.2-3b-preview", 
+    "llama3-8b-8192",
+    "llama3-70b-8192",
+    "mixtral-8x7b-32768",
+    "gemma-7b-it"
+]
+
+async def _probe_model(client, model):
+    """Send a single prompt to one model and report (model, ok, detail)"""
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "user", "content": "Say hello"}
+        ],
+        "temperature": 0.1,
+        "max_tokens": 50
+    }
     
+    try:
+        response = await client.post(f"{GROQ_BASE_URL}/chat/completions", json=payload)
+        
+        if response.status_code == 200:
+            data = response.json()
+            message = data["choices"][0]["message"]["content"]
+            return model, True, message.strip()
+        else:
+            error_data = response.json()
+            return model, False, error_data.get('error', {}).get('message', 'Unknown error')
+            
+    except Exception as e:
+        return model, False, f"Connection error - {e}"
+
+async def _probe_all_models():
+    """Probe every model concurrently over one keep-alive connection pool"""
     headers = {
         "Authorization": f"Bearer {GROQ_API_KEY}",
         "Content-Type": "application/json"
     }
     
+    async with httpx.AsyncClient(
+        headers=headers,
+        timeout=15.0,
+        limits=httpx.Limits(max_keepalive_connections=8)
+    ) as client:
+        return await asyncio.gather(*[_probe_model(client, model) for model in MODELS_TO_TEST])
+
+def test_models():
+    """Test different Groq models"""
+    print("🔍 Testing available Groq models...")
+    
     working_models = []
     
-    for model in models_to_test:
+    for model, ok, detail in asyncio.run(_probe_all_models()):
         print(f"\n🧪 Testing model: {model}")
-        
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "user", "content": "Say hello"}
-            ],
-            "temperature": 0.1,
-            "max_tokens": 50
-        }
-        
-        try:
-            with httpx.Client(timeout=15.0) as client:
-                response = client.post(
-                    f"{GROQ_BASE_URL}/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    message = data["choices"][0]["message"]["content"]
-                    print(f"✅ {model}: {message.strip()}")
-                    working_models.append(model)
-                else:
-                    error_data = response.json()
-                    print(f"❌ {model}: {error_data.get('error', {}).get('message', 'Unknown error')}")
-                    
-        except Exception as e:
-            print(f"❌ {model}: Connection error - {e}")
+        if ok:
+            print(f"✅ {model}: {detail}")
+            working_models.append(model)
+        else:
+            print(f"❌ {model}: {detail}")
     
     return working_models
 
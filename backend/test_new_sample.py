@@ -10,18 +10,17 @@ from datetime import date
 
 API_BASE = "http://localhost:8000"
 
-def load_and_test_csv(filename):
-    """Load CSV and test with AI insights"""
+def load_inventory_records(filename):
+    """Load a sample CSV once and convert it to inventory records"""
+    df = pd.read_csv(f"../frontend/{filename}")
+    print(f"📊 Loaded {len(df)} items from {filename}")
+    return df.to_dict('records')
+
+def load_and_test_csv(filename, inventory_data):
+    """Test AI insights with the loaded CSV records"""
     print(f"🔍 Testing {filename}...")
     
     try:
-        # Load CSV
-        df = pd.read_csv(f"../frontend/{filename}")
-        print(f"📊 Loaded {len(df)} items from {filename}")
-        
-        # Convert to records
-        inventory_data = df.to_dict('records')
-        
         # Test with AI insights
         payload = {
             "inventory_data": inventory_data,
@@ -53,15 +52,11 @@ def load_and_test_csv(filename):
         print(f"❌ Exception: {e}")
         return False
 
-def test_chat_with_data(filename):
+def test_chat_with_data(filename, inventory_data):
     """Test chat with the sample data"""
     print(f"\n💬 Testing chat with {filename}...")
     
     try:
-        # Load CSV
-        df = pd.read_csv(f"../frontend/{filename}")
-        inventory_data = df.to_dict('records')
-        
         # Test chat
         payload = {
             "message": "What are the highest risk items in my inventory?",
@@ -93,8 +88,14 @@ if __name__ == "__main__":
     
     for filename in files:
         print(f"\n{'='*20} {filename} {'='*20}")
-        insights_ok = load_and_test_csv(filename)
-        chat_ok = test_chat_with_data(filename)
+        try:
+            inventory_data = load_inventory_records(filename)
+        except Exception as e:
+            print(f"❌ Could not load {filename}: {e}")
+            continue
+        
+        insights_ok = load_and_test_csv(filename, inventory_data)
+        chat_ok = test_chat_with_data(filename, inventory_data)
         
         print(f"\n📊 Results for {filename}:")
         print(f"  AI Insights: {'✅' if insights_ok else '❌'}")